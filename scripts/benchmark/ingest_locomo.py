@@ -13,16 +13,43 @@ Usage:
 """
 
 import argparse
+import asyncio
 import json
+import logging
+import random
 import re
-import time
+import sys
 import httpx
 from datetime import datetime
+from functools import lru_cache
+from itertools import islice
+from logging.handlers import QueueHandler, QueueListener
 from pathlib import Path
+from queue import SimpleQueue
+from typing import Iterable, Iterator, Optional
 
 from locomo_utils import sample_id_to_uuid
 
+try:
+    import ijson
+except ImportError:  # optional: fall back to loading the whole file
+    ijson = None
 
+try:
+    import orjson
+except ImportError:  # optional: fall back to the stdlib codec
+    orjson = None
+
+log = logging.getLogger(__name__)
+
+_LOCOMO_DATE_RE = re.compile(
+    r"\d{1,2}:\d{2}\s*(?:am|pm)\s+on\s+(\d{1,2})\s+(\w+),?\s+(\d{4})",
+    re.IGNORECASE,
+)
+_SESSION_KEY_RE = re.compile(r"session_(\d+)")
+
+
+@lru_cache(maxsize=4096)
 def normalize_locomo_date(date_str: str) -> str:
     """Convert LoCoMo natural-language dates to ISO 8601 format.
 
@@ -31,11 +58,7 @@ def normalize_locomo_date(date_str: str) -> str:
         "10:30 am on 25 June, 2023" -> "2023-06-25"
     Falls back to the original string if parsing fails.
     """
-    match = re.match(
-        r"\d{1,2}:\d{2}\s*(?:am|pm)\s+on\s+(\d{1,2})\s+(\w+),?\s+(\d{4})",
-        date_str.strip(),
-        re.IGNORECASE,
-    )
+    match = _LOCOMO_DATE_RE.match(date_str.strip())
     if not match:
         return date_str
 
@@ -47,81 +70,226 @@ def normalize_locomo_date(date_str: str) -> str:
         return date_str
 
 
+def positive_int(value: str) -> int:
+    """argparse type for options that must be a positive integer."""
+    number = int(value)
+    if number <= 0:
+        raise argparse.ArgumentTypeError(f"must be a positive integer, got {value}")
+    return number
+
+
+def load_json(raw: bytes):
+    """Decode JSON bytes, with orjson when available."""
+    return orjson.loads(raw) if orjson is not None else json.loads(raw)
+
+
+def dump_json(value) -> bytes:
+    """Encode a value as JSON bytes, with orjson when available."""
+    return orjson.dumps(value) if orjson is not None else json.dumps(value).encode()
+
+
+def iter_samples(data_path: Path, limit: Optional[int] = None) -> Iterator[dict]:
+    """Yield samples one at a time, streaming the file when ijson is available."""
+    if ijson is None:
+        yield from islice(load_json(data_path.read_bytes()), limit)
+        return
+    with open(data_path, "rb") as f:
+        yield from islice(ijson.items(f, "item", use_float=True), limit)
+
+
 def pair_turns(turns: list[dict]) -> list[dict]:
     """Pair consecutive speaker turns into user/assistant exchanges."""
-    pairs = []
-    i = 0
-    while i < len(turns) - 1:
-        pairs.append({
-            "user": f"{turns[i]['speaker']}: {turns[i]['text']}",
-            "assistant": f"{turns[i+1]['speaker']}: {turns[i+1]['text']}",
-        })
-        i += 2
-    if i < len(turns):
+    # Build each "Speaker: " prefix once; a session only has a couple of speakers
+    prefixes = {speaker: sys.intern(f"{speaker}: ") for speaker in {t["speaker"] for t in turns}}
+    pairs = [
+        {
+            "user": prefixes[a["speaker"]] + a["text"],
+            "assistant": prefixes[b["speaker"]] + b["text"],
+        }
+        for a, b in zip(turns[0::2], turns[1::2])
+    ]
+    if len(turns) % 2:
+        last = turns[-1]
         pairs.append({
-            "user": f"{turns[i]['speaker']}: {turns[i]['text']}",
+            "user": prefixes[last["speaker"]] + last["text"],
             "assistant": "(no response)",
         })
     return pairs
 
 
-def ingest_sample(client: httpx.Client, base_url: str, sample: dict, chunks_only: bool = False):
+def setup_logging() -> QueueListener:
+    """Route log output through a queue so ingest workers never block on stdout.
+
+    The caller must stop the returned listener to flush pending records.
+    """
+    records: SimpleQueue = SimpleQueue()
+    # QueueHandler formats records before enqueueing them
+    queue_handler = QueueHandler(records)
+    queue_handler.setFormatter(logging.Formatter("%(message)s"))
+    logging.basicConfig(level=logging.INFO, handlers=[queue_handler])
+    # httpx logs every request at INFO
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+    listener = QueueListener(records, logging.StreamHandler(sys.stdout))
+    listener.start()
+    return listener
+
+
+async def post_session(client: httpx.AsyncClient, date_str: str, payload: dict, label: str) -> int:
+    """POST one session payload, retrying on timeouts and dropped connections.
+
+    Returns the number of turns ingested.
+    """
+    cid = payload["conversation_id"]
+    # Encode once up front; retries resend the same bytes
+    body = dump_json(payload)
+    for attempt in range(5):
+        try:
+            resp = await client.post(
+                "/memory/ingest", content=body, headers={"Content-Type": "application/json"}
+            )
+            resp.raise_for_status()
+            result = resp.json()
+            ingested = result.get("turns_ingested", 0)
+            log.info("  %s (%s -> %s): %d %s ingested", cid, date_str, payload["session_date"], ingested, label)
+            return ingested
+        except (httpx.ReadTimeout, httpx.ConnectTimeout, httpx.RemoteProtocolError) as e:
+            reason = "timeout" if isinstance(e, httpx.TimeoutException) else "connection dropped"
+            if attempt == 4:
+                log.warning("  %s: %s, FAILED after 5 attempts, skipping", cid, reason)
+                break
+            # Exponential backoff with jitter so concurrent retries don't line up
+            wait = min(2**attempt + random.uniform(0, 0.5), 30)
+            log.warning("  %s: %s (attempt %d/5), retrying in %.1fs…", cid, reason, attempt + 1, wait)
+            await asyncio.sleep(wait)
+        except httpx.HTTPStatusError as e:
+            log.warning("  %s: HTTP %d, skipping", cid, e.response.status_code)
+            break
+    return 0
+
+
+def build_sessions(sample: dict, agent_id: str, chunks_only: bool = False) -> list[tuple[str, dict]]:
+    """Build the /memory/ingest payload for every session of one sample.
+
+    Returns (raw date string, payload) tuples in chronological order.
+    """
     sample_id = sample["sample_id"]
-    agent_id = sample_id_to_uuid(sample_id)
     conv = sample.get("conversation", {})
 
+    # Only exact "session_<n>" keys hold turns; sort them numerically
     session_keys = sorted(
-        [k for k in conv if k.startswith("session_") and "date_time" not in k],
-        key=lambda x: int(x.split("_")[1]),
+        (int(m.group(1)), k) for k in conv if (m := _SESSION_KEY_RE.fullmatch(k))
     )
 
-    total_turns = 0
-    for sk in session_keys:
-        session_num = sk.split("_")[1]
+    sessions = []
+    for session_num, sk in session_keys:
         conversation_id = f"{sample_id}_session_{session_num}"
         date_str = conv.get(f"{sk}_date_time", "unknown date")
         iso_date = normalize_locomo_date(date_str)
         turns = conv[sk]
 
-        pairs = pair_turns(turns)
-        if not chunks_only:
-            date_header_turn = {
-                "user": f"[Conversation date: {date_str}]",
-                "assistant": "(acknowledged)",
-            }
-            pairs = [date_header_turn] + pairs
-
         payload = {
             "agent_id": agent_id,
             "conversation_id": conversation_id,
-            "turns": pairs,
+            "turns": pair_turns(turns),
             "session_date": iso_date,
         }
         if chunks_only:
             payload["skip_extraction"] = True
+        else:
+            # Human-readable date for servers that want to add a date note themselves
+            payload["session_date_header"] = date_str
 
-        timeout = 30 if chunks_only else 300
-        for attempt in range(5):
-            try:
-                resp = client.post(f"{base_url}/memory/ingest", json=payload, timeout=timeout)
-                resp.raise_for_status()
-                result = resp.json()
-                ingested = result.get("turns_ingested", 0)
-                total_turns += ingested
-                label = "chunks" if chunks_only else "turns"
-                print(f"  {sk} ({date_str} -> {iso_date}): {ingested} {label} ingested")
-                break
-            except (httpx.ReadTimeout, httpx.ConnectTimeout) as e:
-                wait = 5 * (attempt + 1)
-                print(f"  {sk}: timeout (attempt {attempt+1}/5), retrying in {wait}s…")
-                time.sleep(wait)
-                if attempt == 4:
-                    print(f"  {sk}: FAILED after 5 attempts, skipping")
-            except httpx.HTTPStatusError as e:
-                print(f"  {sk}: HTTP {e.response.status_code}, skipping")
-                break
+        sessions.append((date_str, payload))
+    return sessions
+
+
+async def ingest_all(
+    base_url: str,
+    samples: Iterable[dict],
+    concurrency: int,
+    delay: float,
+    chunks_only: bool = False,
+    batch: bool = False,
+) -> list[tuple[str, str, int]]:
+    """Ingest samples through a bounded queue drained by `concurrency` workers.
+
+    A producer streams samples and builds their session payloads while the
+    workers post them, so parsing overlaps with network I/O and the input is
+    never held in memory all at once. Each queue item is a whole sample,
+    posted session by session in chronological order; with `batch` every
+    session is its own item and may be posted alongside its siblings.
+
+    Returns (sample ID, agent ID, turns ingested) for each sample, in input
+    order, so callers need no separate pass over the input.
+    """
+    label = "chunks" if chunks_only else "turns"
+    queue: asyncio.Queue = asyncio.Queue(maxsize=concurrency * 4)
+    # (sample ID, agent ID) per sample, filled as the producer streams them
+    agent_ids: list[tuple[str, str]] = []
+    # results[i][j] holds the outcome of session j of sample i
+    results: list[list[int]] = []
+
+    # One pooled client for the whole run; limits live on the transport since
+    # httpx ignores client-level limits when a transport is supplied.
+    transport = httpx.AsyncHTTPTransport(
+        http2=False,
+        retries=0,
+        limits=httpx.Limits(
+            max_keepalive_connections=16,
+            max_connections=max(32, concurrency),
+            keepalive_expiry=600,
+        ),
+    )
+    timeout = httpx.Timeout(connect=5, read=30 if chunks_only else 300, write=30, pool=5)
+
+    async with httpx.AsyncClient(
+        base_url=base_url, transport=transport, timeout=timeout, trust_env=False
+    ) as client:
+
+        async def worker() -> None:
+            while True:
+                i, first, sessions = await queue.get()
+                try:
+                    for j, (date_str, payload) in enumerate(sessions, first):
+                        results[i][j] = await post_session(client, date_str, payload, label)
+                    # Give the server time to process memory asynchronously
+                    if delay > 0:
+                        await asyncio.sleep(delay)
+                finally:
+                    queue.task_done()
+
+        async def produce() -> None:
+            for i, sample in enumerate(samples):
+                sample_id = sample["sample_id"]
+                agent_id = sample_id_to_uuid(sample_id)
+                log.info("[%d] Sample %s (agent: %s)", i + 1, sample_id, agent_id)
+                agent_ids.append((sample_id, agent_id))
+                sessions = build_sessions(sample, agent_id, chunks_only=chunks_only)
+                results.append([0] * len(sessions))
+                if batch:
+                    for j, session in enumerate(sessions):
+                        await queue.put((i, j, [session]))
+                else:
+                    await queue.put((i, 0, sessions))
+            await queue.join()
 
-    return total_turns
+        workers = [asyncio.create_task(worker()) for _ in range(concurrency)]
+        producer = asyncio.create_task(produce())
+        tasks = [producer, *workers]
+        try:
+            # Workers only exit by raising; surface that instead of waiting on join() forever
+            done, _ = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                task.result()
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    return [
+        (sample_id, agent_id, sum(sample_results))
+        for (sample_id, agent_id), sample_results in zip(agent_ids, results)
+    ]
 
 
 def main():
@@ -138,7 +306,7 @@ def main():
     )
     parser.add_argument(
         "--samples",
-        type=int,
+        type=positive_int,
         default=None,
         help="Limit number of samples to ingest",
     )
@@ -146,13 +314,27 @@ def main():
         "--delay",
         type=float,
         default=1.0,
-        help="Delay in seconds between sessions to allow async memory processing",
+        help="Delay in seconds after each sample (each session with --batch) to allow async memory processing",
     )
     parser.add_argument(
         "--chunks-only",
         action="store_true",
         help="Only store conversation chunks (no LLM extraction). Fast backfill.",
     )
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=8,
+        help="Number of concurrent ingest workers",
+    )
+    parser.add_argument(
+        "--batch",
+        action=argparse.BooleanOptionalAction,
+        default=False,
+        help="Queue each session separately so a sample's sessions are posted concurrently "
+        "instead of in chronological order. "
+        "Best paired with --chunks-only, since extraction expects sessions in order.",
+    )
     args = parser.parse_args()
 
     data_path = Path(args.data)
@@ -160,41 +342,40 @@ def main():
         print(f"Error: {data_path} not found")
         return
 
-    with open(data_path) as f:
-        samples = json.load(f)
-    if args.samples:
-        samples = samples[: args.samples]
+    listener = setup_logging()
+    try:
+        ingest(args, data_path)
+    finally:
+        listener.stop()
+
 
+def ingest(args: argparse.Namespace, data_path: Path) -> None:
     mode = "chunks only (no LLM)" if args.chunks_only else "full extraction"
-    print(f"Ingesting {len(samples)} samples into Osaurus memory at {args.base_url} [{mode}]")
-    print()
-
-    print("Agent ID mapping:")
-    for s in samples:
-        sid = s["sample_id"]
-        print(f"  {sid} -> {sample_id_to_uuid(sid)}")
-    print()
-
-    grand_total = 0
-    with httpx.Client() as client:
-        for i, sample in enumerate(samples):
-            sample_id = sample["sample_id"]
-            agent_id = sample_id_to_uuid(sample_id)
-            print(f"[{i+1}/{len(samples)}] Sample {sample_id} (agent: {agent_id})")
-
-            total = ingest_sample(client, args.base_url, sample, chunks_only=args.chunks_only)
-            grand_total += total
-            print(f"  Total: {total} turns\n")
-
-            if args.delay > 0:
-                time.sleep(args.delay)
-
-    print(f"Done! Ingested {grand_total} turns across {len(samples)} samples.")
-    print()
-    print("Agent IDs for EasyLocomo --no-context evaluation:")
-    for s in samples:
-        sid = s["sample_id"]
-        print(f"  {sid}: {sample_id_to_uuid(sid)}")
+    log.info("Ingesting %s into Osaurus memory at %s [%s]", data_path, args.base_url, mode)
+    log.info("")
+
+    results = asyncio.run(
+        ingest_all(
+            args.base_url,
+            iter_samples(data_path, args.samples),
+            concurrency=max(1, args.concurrency),
+            delay=args.delay,
+            chunks_only=args.chunks_only,
+            batch=args.batch,
+        )
+    )
+
+    log.info("")
+    for i, (sample_id, agent_id, total) in enumerate(results):
+        log.info("[%d/%d] Sample %s (agent: %s): %d turns", i + 1, len(results), sample_id, agent_id, total)
+    log.info("")
+
+    grand_total = sum(total for _, _, total in results)
+    log.info("Done! Ingested %d turns across %d samples.", grand_total, len(results))
+    log.info("")
+    log.info("Agent IDs for EasyLocomo --no-context evaluation:")
+    for sample_id, agent_id, _ in results:
+        log.info("  %s: %s", sample_id, agent_id)
 
 
 if __name__ == "__main__":
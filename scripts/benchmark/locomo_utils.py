@@ -1,8 +1,21 @@
 """Shared utilities for LOCOMO benchmark scripts."""
 
+import hashlib
 import uuid
+from functools import cache
 
+_NAMESPACE = uuid.NAMESPACE_DNS.bytes
 
+
+@cache
 def sample_id_to_uuid(sample_id: str) -> str:
-    """Deterministic agent UUID from a LOCOMO sample ID."""
-    return str(uuid.uuid5(uuid.NAMESPACE_DNS, f"locomo.{sample_id}"))
+    """Deterministic agent UUID from a LOCOMO sample ID.
+
+    Same value as uuid.uuid5(uuid.NAMESPACE_DNS, f"locomo.{sample_id}"),
+    formatted straight from the SHA-1 digest.
+    """
+    digest = bytearray(hashlib.sha1(_NAMESPACE + f"locomo.{sample_id}".encode()).digest()[:16])
+    digest[6] = (digest[6] & 0x0F) | 0x50  # version 5
+    digest[8] = (digest[8] & 0x3F) | 0x80  # RFC 4122 variant
+    h = digest.hex()
+    return f"{h[:8]}-{h[8:12]}-{h[12:16]}-{h[16:20]}-{h[20:]}"
@@ -6,47 +6,66 @@ This script parses Swift Package Manager Package.resolved files and generates
 a JSON file containing license information for all dependencies.
 
 Usage:
-    python3 generate_acknowledgements.py
+    python3 generate_acknowledgements.py [--no-cache]
+
+Parsed Package.resolved files are cached under scripts/release/.cache,
+keyed by CACHE_VERSION and each file's mtime and contents.
 
 Output:
     App/osaurus/Acknowledgements.json
 """
 
+import argparse
+import hashlib
 import json
 import os
+import sys
 from pathlib import Path
-from typing import Dict, List, Optional
+from types import MappingProxyType
+from typing import Dict, List, Mapping, Optional
+
+try:
+    import orjson
+except ImportError:  # optional: fall back to the stdlib encoder
+    orjson = None
+
+CACHE_DIR = Path(__file__).parent / ".cache"
+# Part of every cache key; bump whenever pin parsing or dependency derivation changes
+CACHE_VERSION = 1
 
-# Known licenses for dependencies
+_APACHE2 = sys.intern("Apache 2.0")
+_MIT = sys.intern("MIT")
+
+# Known licenses for dependencies (read-only)
 # Format: package_identity -> (license_type, license_url, repository_url)
-KNOWN_LICENSES: Dict[str, tuple] = {
+KNOWN_LICENSES: Mapping[str, tuple] = MappingProxyType({
     # Apple packages (Apache 2.0)
-    "swift-nio": ("Apache 2.0", "https://github.com/apple/swift-nio/blob/main/LICENSE.txt", "https://github.com/apple/swift-nio"),
-    "swift-atomics": ("Apache 2.0", "https://github.com/apple/swift-atomics/blob/main/LICENSE.txt", "https://github.com/apple/swift-atomics"),
-    "swift-collections": ("Apache 2.0", "https://github.com/apple/swift-collections/blob/main/LICENSE.txt", "https://github.com/apple/swift-collections"),
-    "swift-log": ("Apache 2.0", "https://github.com/apple/swift-log/blob/main/LICENSE.txt", "https://github.com/apple/swift-log"),
-    "swift-numerics": ("Apache 2.0", "https://github.com/apple/swift-numerics/blob/main/LICENSE", "https://github.com/apple/swift-numerics"),
-    "swift-system": ("Apache 2.0", "https://github.com/apple/swift-system/blob/main/LICENSE.txt", "https://github.com/apple/swift-system"),
-    "swift-argument-parser": ("Apache 2.0", "https://github.com/apple/swift-argument-parser/blob/main/LICENSE.txt", "https://github.com/apple/swift-argument-parser"),
+    "swift-nio": (_APACHE2, "https://github.com/apple/swift-nio/blob/main/LICENSE.txt", "https://github.com/apple/swift-nio"),
+    "swift-atomics": (_APACHE2, "https://github.com/apple/swift-atomics/blob/main/LICENSE.txt", "https://github.com/apple/swift-atomics"),
+    "swift-collections": (_APACHE2, "https://github.com/apple/swift-collections/blob/main/LICENSE.txt", "https://github.com/apple/swift-collections"),
+    "swift-log": (_APACHE2, "https://github.com/apple/swift-log/blob/main/LICENSE.txt", "https://github.com/apple/swift-log"),
+    "swift-numerics": (_APACHE2, "https://github.com/apple/swift-numerics/blob/main/LICENSE", "https://github.com/apple/swift-numerics"),
+    "swift-system": (_APACHE2, "https://github.com/apple/swift-system/blob/main/LICENSE.txt", "https://github.com/apple/swift-system"),
+    "swift-argument-parser": (_APACHE2, "https://github.com/apple/swift-argument-parser/blob/main/LICENSE.txt", "https://github.com/apple/swift-argument-parser"),
     
     # Hugging Face packages (Apache 2.0)
-    "swift-transformers": ("Apache 2.0", "https://github.com/huggingface/swift-transformers/blob/main/LICENSE", "https://github.com/huggingface/swift-transformers"),
-    "swift-jinja": ("Apache 2.0", "https://github.com/huggingface/swift-jinja/blob/main/LICENSE", "https://github.com/huggingface/swift-jinja"),
+    "swift-transformers": (_APACHE2, "https://github.com/huggingface/swift-transformers/blob/main/LICENSE", "https://github.com/huggingface/swift-transformers"),
+    "swift-jinja": (_APACHE2, "https://github.com/huggingface/swift-jinja/blob/main/LICENSE", "https://github.com/huggingface/swift-jinja"),
     
     # MLX packages (MIT)
-    "mlx-swift": ("MIT", "https://github.com/ml-explore/mlx-swift/blob/main/LICENSE", "https://github.com/ml-explore/mlx-swift"),
-    "mlx-swift-lm": ("MIT", "https://github.com/ml-explore/mlx-swift-lm/blob/main/LICENSE", "https://github.com/ml-explore/mlx-swift-lm"),
+    "mlx-swift": (_MIT, "https://github.com/ml-explore/mlx-swift/blob/main/LICENSE", "https://github.com/ml-explore/mlx-swift"),
+    "mlx-swift-lm": (_MIT, "https://github.com/ml-explore/mlx-swift-lm/blob/main/LICENSE", "https://github.com/ml-explore/mlx-swift-lm"),
     
     # Other packages
-    "sparkle": ("MIT", "https://github.com/sparkle-project/Sparkle/blob/2.x/LICENSE", "https://github.com/sparkle-project/Sparkle"),
-    "fluidaudio": ("Apache 2.0", "https://github.com/FluidInference/FluidAudio/blob/main/LICENSE", "https://github.com/FluidInference/FluidAudio"),
-    "swift-sdk": ("MIT", "https://github.com/modelcontextprotocol/swift-sdk/blob/main/LICENSE", "https://github.com/modelcontextprotocol/swift-sdk"),
-    "ikigajson": ("MIT", "https://github.com/orlandos-nl/IkigaJSON/blob/master/LICENSE", "https://github.com/orlandos-nl/IkigaJSON"),
-    "eventsource": ("MIT", "https://github.com/mattt/EventSource/blob/main/LICENSE", "https://github.com/mattt/EventSource"),
-}
-
-# Human-readable names for packages
-PACKAGE_NAMES: Dict[str, str] = {
+    "sparkle": (_MIT, "https://github.com/sparkle-project/Sparkle/blob/2.x/LICENSE", "https://github.com/sparkle-project/Sparkle"),
+    "fluidaudio": (_APACHE2, "https://github.com/FluidInference/FluidAudio/blob/main/LICENSE", "https://github.com/FluidInference/FluidAudio"),
+    "swift-sdk": (_MIT, "https://github.com/modelcontextprotocol/swift-sdk/blob/main/LICENSE", "https://github.com/modelcontextprotocol/swift-sdk"),
+    "ikigajson": (_MIT, "https://github.com/orlandos-nl/IkigaJSON/blob/master/LICENSE", "https://github.com/orlandos-nl/IkigaJSON"),
+    "eventsource": (_MIT, "https://github.com/mattt/EventSource/blob/main/LICENSE", "https://github.com/mattt/EventSource"),
+})
+
+# Human-readable names for packages (read-only)
+PACKAGE_NAMES: Mapping[str, str] = MappingProxyType({
     "swift-nio": "SwiftNIO",
     "swift-atomics": "Swift Atomics",
     "swift-collections": "Swift Collections",
@@ -63,23 +82,65 @@ PACKAGE_NAMES: Dict[str, str] = {
     "swift-sdk": "MCP Swift SDK",
     "ikigajson": "IkigaJSON",
     "eventsource": "EventSource",
-}
+})
+
+
+def file_cache_key(path: Path, data: bytes) -> str:
+    """Cache key for a file, derived from CACHE_VERSION, its mtime and contents."""
+    header = f"v{CACHE_VERSION}:{path.stat().st_mtime_ns}:".encode()
+    return hashlib.sha1(header + data).hexdigest()
+
+
+def load_json(raw: bytes):
+    """Decode JSON bytes, with orjson when available."""
+    return orjson.loads(raw) if orjson is not None else json.loads(raw)
+
+
+def read_cache(kind: str, key: str):
+    """Load a cached JSON value, or None on a miss or unreadable entry."""
+    try:
+        return load_json((CACHE_DIR / f"{kind}_{key}.json").read_bytes())
+    except (OSError, ValueError):
+        return None
 
 
-def parse_package_resolved(path: Path) -> List[Dict]:
-    """Parse a Package.resolved file and return list of dependencies."""
-    if not path.exists():
-        print(f"Warning: {path} not found")
-        return []
+def write_cache(kind: str, key: str, value) -> None:
+    """Store a JSON value in the cache, replacing older entries of the same kind.
+
+    Failures only cost a re-parse next run.
+    """
+    try:
+        CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        cache_path = CACHE_DIR / f"{kind}_{key}.json"
+        cache_path.write_text(json.dumps(value))
+        for stale in CACHE_DIR.glob(f"{kind}_*.json"):
+            if stale != cache_path:
+                stale.unlink(missing_ok=True)
+    except OSError:
+        pass
+
+
+def parse_package_resolved(path: Path, raw: bytes, cache_key: Optional[str] = None) -> List[Dict]:
+    """Parse the contents of a Package.resolved file and return its pins.
+
+    Pins are cached under `cache_key` when one is given.
+    """
+    # One cache slot per source file, so pruning never evicts a sibling's pins
+    kind = f"pins-{hashlib.sha1(str(path).encode()).hexdigest()[:12]}"
+    if cache_key:
+        cached = read_cache(kind, cache_key)
+        if cached is not None:
+            return cached
     
-    with open(path, 'r') as f:
-        data = json.load(f)
+    data = load_json(raw)
     
     pins = data.get("pins", [])
+    if cache_key:
+        write_cache(kind, cache_key, pins)
     return pins
 
 
-def get_all_dependencies(project_root: Path) -> Dict[str, Dict]:
+def get_all_dependencies(project_root: Path, use_cache: bool = True) -> Dict[str, Dict]:
     """Get all unique dependencies from all Package.resolved files."""
     resolved_files = [
         project_root / "Packages" / "OsaurusCore" / "Package.resolved",
@@ -87,10 +148,30 @@ def get_all_dependencies(project_root: Path) -> Dict[str, Dict]:
         project_root / "osaurus.xcworkspace" / "xcshareddata" / "swiftpm" / "Package.resolved",
     ]
     
+    # Read and key each file once: (path, contents, cache key)
+    sources = []
+    for resolved_file in resolved_files:
+        if not resolved_file.exists():
+            print(f"Warning: {resolved_file} not found")
+            continue
+        raw = resolved_file.read_bytes()
+        sources.append((resolved_file, raw, file_cache_key(resolved_file, raw)))
+    
+    use_cache = use_cache and bool(sources)
+    
+    # Earlier files win on duplicate identities, so the key covers order too
+    deps_key = None
+    if use_cache:
+        combined = "".join(f"{path}:{key}\n" for path, _, key in sources)
+        deps_key = hashlib.sha1(combined.encode()).hexdigest()
+        cached = read_cache("deps", deps_key)
+        if cached is not None:
+            return cached
+    
     dependencies = {}
     
-    for resolved_file in resolved_files:
-        pins = parse_package_resolved(resolved_file)
+    for resolved_file, raw, key in sources:
+        pins = parse_package_resolved(resolved_file, raw, key if use_cache else None)
         for pin in pins:
             identity = pin.get("identity", "")
             if identity and identity not in dependencies:
@@ -100,6 +181,8 @@ def get_all_dependencies(project_root: Path) -> Dict[str, Dict]:
                     "version": pin.get("state", {}).get("version", pin.get("state", {}).get("revision", "")[:8]),
                 }
     
+    if deps_key:
+        write_cache("deps", deps_key, dependencies)
     return dependencies
 
 
@@ -108,15 +191,15 @@ def generate_acknowledgements(dependencies: Dict[str, Dict]) -> List[Dict]:
     acknowledgements = []
     
     for identity, dep in sorted(dependencies.items()):
-        license_info = KNOWN_LICENSES.get(identity)
+        license_type, license_url, repository = KNOWN_LICENSES.get(identity, ("Unknown", "", ""))
         
         entry = {
-            "name": PACKAGE_NAMES.get(identity, identity.replace("-", " ").title()),
+            "name": PACKAGE_NAMES.get(identity) or identity.replace("-", " ").title(),
             "identity": identity,
             "version": dep.get("version", ""),
-            "repository": dep.get("location", license_info[2] if license_info else ""),
-            "license": license_info[0] if license_info else "Unknown",
-            "licenseUrl": license_info[1] if license_info else "",
+            "repository": dep.get("location") or repository,
+            "license": license_type,
+            "licenseUrl": license_url,
         }
         
         acknowledgements.append(entry)
@@ -125,6 +208,14 @@ def generate_acknowledgements(dependencies: Dict[str, Dict]) -> List[Dict]:
 
 
 def main():
+    parser = argparse.ArgumentParser(description="Generate Acknowledgements.json from Package.resolved files")
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Re-parse every Package.resolved file instead of using cached results",
+    )
+    args = parser.parse_args()
+    
     # Find project root (where this script is in scripts/)
     script_dir = Path(__file__).parent.resolve()
     project_root = script_dir.parent
@@ -132,7 +223,7 @@ def main():
     print(f"Project root: {project_root}")
     
     # Get all dependencies
-    dependencies = get_all_dependencies(project_root)
+    dependencies = get_all_dependencies(project_root, use_cache=not args.no_cache)
     print(f"Found {len(dependencies)} unique dependencies")
     
     # Generate acknowledgements
@@ -146,8 +237,13 @@ def main():
     }
     
     output_path = project_root / "App" / "osaurus" / "Acknowledgements.json"
-    with open(output_path, 'w') as f:
-        json.dump(output, f, indent=2)
+    if orjson is not None:
+        with open(output_path, 'wb') as f:
+            f.write(orjson.dumps(output, option=orjson.OPT_INDENT_2))
+    else:
+        # Match orjson's raw UTF-8 output so the file doesn't depend on which encoder ran
+        with open(output_path, 'w', encoding='utf-8') as f:
+            json.dump(output, f, indent=2, ensure_ascii=False)
     
     print(f"Generated {output_path}")
     print(f"Total acknowledgements: {len(acknowledgements)}")